@@ -1,59 +1,369 @@
 import os
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, abort, g, has_app_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager, jwt_required, create_access_token, get_jwt_identity
-from werkzeug.utils import secure_filename
-from models import db, User, Issue, IssueImage, StatusLog
-from geopy.distance import geodesic
+from flask_jwt_extended import JWTManager, jwt_required, create_access_token, get_jwt, get_jwt_identity
+from sqlalchemy import case, delete, event, func, or_, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from werkzeug.security import safe_join
+from models import db, upgrade_schema, User, Issue, IssueImage, StatusLog, Vote
 from config import Config
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-import uuid
+from typing import List, Optional
+from cachetools import TTLCache
+import numpy as np
+import orjson
+import hashlib
+import math
+import mimetypes
+import threading
+import tempfile
+import time
+
+if Config.USE_POSTGIS:
+    from geoalchemy2 import Geography
+if Config.REDIS_URL:
+    import redis
+try:
+    from numba import njit
+except ImportError:  # optional, see requirements-numba.txt
+    njit = None
+
+class CachingJWTManager(JWTManager):
+    """JWTManager that remembers verified tokens for a short while so repeat
+    requests with the same token skip signature verification."""
+
+    def __init__(self, app=None, maxsize=10000, ttl=30):
+        self._decoded_cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._decoded_cache_lock = threading.Lock()
+        self._decoded_cache_ttl = ttl
+        super().__init__(app)
+
+    def _decode_jwt_from_config(self, encoded_token, csrf_value=None, allow_expired=False):
+        if csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        key = hashlib.blake2b(encoded_token.encode(), digest_size=16).digest()
+        now = time.time()
+        with self._decoded_cache_lock:
+            cached = self._decoded_cache.get(key)
+        if cached and cached[1] > now:
+            return cached[0]
+
+        decoded = super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+        # Never serve a cached token past its own expiry
+        expires_at = min(decoded.get('exp', now), now + self._decoded_cache_ttl)
+        with self._decoded_cache_lock:
+            self._decoded_cache[key] = (decoded, expires_at)
+        return decoded
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serialize responses with orjson, which handles datetimes natively."""
+
+    def dumps_bytes(self, obj, indent=False):
+        # Sorts plain dict keys; dataclasses such as IssueDTO keep field order
+        option = orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        return self.dumps_bytes(obj, indent=bool(kwargs.get('indent'))).decode()
+
+    def response_body(self, obj):
+        """Encode obj exactly as response() would, as bytes that can be cached."""
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self.dumps_bytes(obj, indent=indent) + b'\n'
+
+    def body_response(self, body):
+        """Wrap a body from response_body() in a JSON response."""
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config.from_object(Config)
 CORS(app)
-jwt = JWTManager(app)
+jwt = CachingJWTManager(app)
 db.init_app(app)
 
 # Ensure upload folder exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
-def allowed_file(filename):
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
+# Image writes run here so they overlap with the issue INSERT
+upload_executor = ThreadPoolExecutor(max_workers=app.config['UPLOAD_WORKERS'])
+# Copy uploads in 1MB chunks rather than werkzeug's 16KB default
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+
+# Optional cache for radius queries; disabled when REDIS_URL is unset
+redis_client = redis.Redis.from_url(app.config['REDIS_URL']) if app.config['REDIS_URL'] else None
+ISSUES_CACHE_GENERATION_KEY = 'issues:generation'
+
+ALLOWED_EXTENSIONS = frozenset(Config.ALLOWED_EXTENSIONS)
+# Uploads are named by content hash, so a stored file never changes
+UPLOAD_MAX_AGE = 365 * 24 * 60 * 60
+
+def allowed_extension(filename):
+    # Parse once; the result is reused for the stored filename
+    ext = os.path.splitext(filename)[1][1:].lower()
+    return ext if ext in ALLOWED_EXTENSIONS else None
+
+def store_upload(file, ext):
+    # Hash while streaming to a temp file, then name it by content so
+    # duplicate photos share one file on disk. Returns the filename and
+    # whether this call created it.
+    folder = app.config['UPLOAD_FOLDER']
+    digest = hashlib.blake2b(digest_size=16)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while chunk := file.stream.read(UPLOAD_BUFFER_SIZE):
+                digest.update(chunk)
+                out.write(chunk)
+        filename = f"{digest.hexdigest()}.{ext}"
+        path = os.path.join(folder, filename)
+        created = not os.path.exists(path)
+        if created:
+            os.replace(tmp_path, path)
+        else:
+            os.remove(tmp_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return filename, created
+
+def discard_uploads(saves):
+    # Wait out in-flight writes, then remove the files this request created;
+    # files that already existed belong to earlier reports
+    for save in saves:
+        try:
+            filename, created = save.result()
+        except Exception:
+            continue
+        if created:
+            try:
+                os.remove(os.path.join(app.config['UPLOAD_FOLDER'], filename))
+            except FileNotFoundError:
+                pass
 
 # Helper functions
-def is_within_radius(user_lat, user_lon, issue_lat, issue_lon, radius_km):
-    return geodesic((user_lat, user_lon), (issue_lat, issue_lon)).km <= radius_km
+EARTH_RADIUS_KM = 6371.0088
+
+if njit is not None:
+    # Serial on purpose: request handlers run on threads, and numba's default
+    # workqueue threading layer is not threadsafe. After the bounding box
+    # there are only a handful of candidates anyway.
+    @njit(fastmath=True, cache=True)
+    def _haversine_mask(lat0, lon0, lats, lons, radius_km):
+        # Trig, distance and compare fused into one pass
+        mask = np.empty(lats.shape[0], dtype=np.bool_)
+        cos_lat0 = math.cos(lat0)
+        for i in range(lats.shape[0]):
+            lat = math.radians(lats[i])
+            a = math.sin((lat - lat0) / 2) ** 2 + \
+                cos_lat0 * math.cos(lat) * math.sin((math.radians(lons[i]) - lon0) / 2) ** 2
+            mask[i] = 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a)) <= radius_km
+        return mask
+
+def within_radius_mask(user_lat, user_lon, lats, lons, radius_km):
+    lat0, lon0 = math.radians(user_lat), math.radians(user_lon)
+    if njit is not None:
+        return _haversine_mask(
+            lat0, lon0, np.ascontiguousarray(lats), np.ascontiguousarray(lons), radius_km
+        )
+    # Vectorised haversine over all candidate rows at once
+    lats, lons = np.radians(lats), np.radians(lons)
+    a = np.sin((lats - lat0) / 2) ** 2 + \
+        math.cos(lat0) * np.cos(lats) * np.sin((lons - lon0) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a)) <= radius_km
+
+def filter_by_bounding_box(query, user_lat, user_lon, radius_km):
+    # Smallest lat/lon box that contains the whole search circle, so the
+    # prefilter never drops an issue the distance check would keep
+    angular = radius_km / EARTH_RADIUS_KM
+    dlat = math.degrees(angular)
+    lat_min, lat_max = user_lat - dlat, user_lat + dlat
+    query = query.filter(Issue.latitude.between(lat_min, lat_max))
+    if lat_min <= -90 or lat_max >= 90:
+        # The circle covers a pole, so every longitude is in play
+        return query
+    # Great circles bulge poleward, so the widest point is wider than r/cos(lat)
+    ratio = math.sin(angular) / math.cos(math.radians(user_lat))
+    if ratio >= 1:
+        return query
+    dlon = math.degrees(math.asin(ratio))
+    lon_min, lon_max = user_lon - dlon, user_lon + dlon
+    # Split the box where it crosses the antimeridian
+    if lon_min < -180:
+        return query.filter(or_(Issue.longitude >= lon_min + 360, Issue.longitude <= lon_max))
+    if lon_max > 180:
+        return query.filter(or_(Issue.longitude >= lon_min, Issue.longitude <= lon_max - 360))
+    return query.filter(Issue.longitude.between(lon_min, lon_max))
+
+def issues_cache_key(*parts):
+    # Writes bump the generation, which orphans every older cached listing
+    generation = int(redis_client.get(ISSUES_CACHE_GENERATION_KEY) or 0)
+    return 'issues:%d:%s' % (generation, ':'.join(str(part) for part in parts))
+
+def cache_get(key_parts):
+    if redis_client is None:
+        return None, None
+    try:
+        key = issues_cache_key(*key_parts)
+        return key, redis_client.get(key)
+    except redis.RedisError:
+        return None, None
+
+def cache_set(key, value):
+    if key is None:
+        return
+    try:
+        redis_client.setex(key, app.config['ISSUES_CACHE_TTL'], value)
+    except redis.RedisError:
+        pass
+
+def invalidate_issues_cache():
+    if redis_client is None:
+        return
+    try:
+        redis_client.incr(ISSUES_CACHE_GENERATION_KEY)
+    except redis.RedisError:
+        pass
+
+def current_user_is_admin():
+    claims = get_jwt()
+    if 'is_admin' in claims:
+        return claims['is_admin']
+    # Tokens issued before the claim was added
+    return User.query.get(get_jwt_identity()).is_admin
+
+def eager_issue_query(query=None):
+    # Load everything format_issue touches up front instead of per row
+    options = [
+        # Many-to-one sides ride along as joins; collections get one IN query each
+        joinedload(Issue.user),
+        selectinload(Issue.images),
+        selectinload(Issue.logs).joinedload(StatusLog.admin)
+    ]
+    if app.debug:
+        # Any other lazy load while formatting a list is an N+1; fail loudly
+        options.append(raiseload('*'))
+    if query is None:
+        query = Issue.query
+    return query.options(*options)
+
+# Slotted DTOs that orjson encodes directly, without building nested dicts.
+# Fields serialize in declaration order; slots=True needs Python 3.10+.
+@dataclass(slots=True)
+class IssueUserDTO:
+    id: int
+    username: str
+    is_anonymous: bool
+
+@dataclass(slots=True)
+class LogAdminDTO:
+    id: int
+    username: str
+
+@dataclass(slots=True)
+class StatusLogDTO:
+    status: str
+    timestamp: datetime
+    admin: Optional[LogAdminDTO]
+
+@dataclass(slots=True)
+class IssueDTO:
+    id: int
+    title: str
+    description: Optional[str]
+    category: str
+    latitude: float
+    longitude: float
+    status: str
+    created_at: datetime
+    user: Optional[IssueUserDTO]
+    upvotes: int
+    flags: int
+    images: List[str]
+    can_edit: bool
+    logs: List[StatusLogDTO]
+
+def format_status_log(log):
+    return StatusLogDTO(
+        status=log.status,
+        timestamp=log.timestamp,
+        admin=LogAdminDTO(
+            id=log.admin.id,
+            username=log.admin.username
+        ) if log.admin else None
+    )
+
+def build_issue_dto(issue, current_user_id, user, images, logs):
+    # Column values come from the issue; the related parts are passed in so
+    # callers that already hold them don't have to go through the relationships
+    return IssueDTO(
+        id=issue.id,
+        title=issue.title,
+        description=issue.description,
+        category=issue.category,
+        latitude=issue.latitude,
+        longitude=issue.longitude,
+        status=issue.status,
+        created_at=issue.created_at,
+        user=user if not issue.is_anonymous else None,
+        upvotes=issue.upvotes,
+        flags=issue.flags,
+        images=images,
+        can_edit=current_user_id == issue.user_id if current_user_id else False,
+        logs=logs
+    )
 
 def format_issue(issue, current_user_id=None):
-    return {
-        "id": issue.id,
-        "title": issue.title,
-        "description": issue.description,
-        "category": issue.category,
-        "latitude": issue.latitude,
-        "longitude": issue.longitude,
-        "status": issue.status,
-        "created_at": issue.created_at.isoformat(),
-        "user": {
-            "id": issue.user.id,
-            "username": issue.user.username,
-            "is_anonymous": issue.is_anonymous
-        } if not issue.is_anonymous else None,
-        "upvotes": issue.upvotes,
-        "flags": issue.flags,
-        "images": [img.filename for img in issue.images],
-        "can_edit": current_user_id == issue.user_id if current_user_id else False,
-        "logs": [{
-            "status": log.status,
-            "timestamp": log.timestamp.isoformat(),
-            "admin": {
-                "id": log.admin.id,
-                "username": log.admin.username
-            } if log.admin else None
-        } for log in issue.logs]
-    }
+    user = IssueUserDTO(
+        id=issue.user.id,
+        username=issue.user.username,
+        is_anonymous=issue.is_anonymous
+    ) if not issue.is_anonymous else None
+    return build_issue_dto(
+        issue, current_user_id, user,
+        images=[img.filename for img in issue.images],
+        logs=[format_status_log(log) for log in issue.logs]
+    )
+
+def current_user_dto():
+    """The requesting user as shown on their issues, read from the token."""
+    claims = get_jwt()
+    if 'username' in claims:
+        return IssueUserDTO(id=get_jwt_identity(), username=claims['username'], is_anonymous=False)
+    # Tokens issued before the claim was added
+    user = db.session.get(User, get_jwt_identity())
+    return IssueUserDTO(id=user.id, username=user.username, is_anonymous=False)
+
+# Debug-only query counting so N+1 regressions show up per response.
+# One listener for every engine; requests opt in by setting g.query_count.
+@event.listens_for(Engine, 'before_cursor_execute')
+def count_request_query(conn, cursor, statement, parameters, context, executemany):
+    if has_app_context() and 'query_count' in g:
+        g.query_count += 1
+
+@app.before_request
+def start_query_count():
+    if app.debug:
+        g.query_count = 0
+
+@app.after_request
+def add_query_count_header(response):
+    if 'query_count' in g:
+        response.headers['X-Query-Count'] = str(g.query_count)
+    return response
 
 # Auth Routes
 @app.route('/api/auth/register', methods=['POST'])
@@ -80,6 +390,9 @@ def login():
     user = User.query.filter_by(username=data['username']).first()
     if not user or not user.check_password(data['password']):
         return jsonify({"error": "Invalid username or password"}), 401
+    if db.session.is_modified(user):
+        # check_password upgraded the stored hash
+        db.session.commit()
     
     return jsonify({
         "message": "Logged in successfully",
@@ -108,25 +421,47 @@ def get_issues():
     
     current_user_id = get_jwt_identity()
     
+    # ~111m grid buckets so nearby refreshes share an entry
+    cache_key, cached = cache_get((
+        round(user_lat, 3), round(user_lon, 3), radius, category, status, current_user_id
+    ))
+    if cached is not None:
+        return app.json.body_response(cached)
+    
     query = Issue.query
     if category:
         query = query.filter_by(category=category)
     if status:
         query = query.filter_by(status=status)
     
-    issues = query.all()
-    nearby_issues = [
-        issue for issue in issues 
-        if is_within_radius(user_lat, user_lon, issue.latitude, issue.longitude, radius)
-    ]
+    if app.config['USE_POSTGIS']:
+        point = func.ST_SetSRID(func.ST_MakePoint(user_lon, user_lat), 4326).cast(
+            Geography(geometry_type='POINT', srid=4326)
+        )
+        query = query.filter(Issue.geom.ST_DWithin(point, radius * 1000))
+    else:
+        # SQLite dev fallback: coarse box in SQL, exact distance in NumPy,
+        # then load only the surviving issues
+        candidates = np.array(
+            filter_by_bounding_box(query, user_lat, user_lon, radius)
+            .with_entities(Issue.id, Issue.latitude, Issue.longitude).all(),
+            dtype=float
+        ).reshape(-1, 3)
+        mask = within_radius_mask(user_lat, user_lon, candidates[:, 1], candidates[:, 2], radius)
+        query = query.filter(Issue.id.in_(candidates[mask, 0].astype(int).tolist()))
+    
+    nearby_issues = eager_issue_query(query).all()
     
-    return jsonify([format_issue(issue, current_user_id) for issue in nearby_issues])
+    body = app.json.response_body([format_issue(issue, current_user_id) for issue in nearby_issues])
+    cache_set(cache_key, body)
+    return app.json.body_response(body)
 
 @app.route('/api/issues', methods=['POST'])
 @jwt_required()
 def report_issue():
     user_id = get_jwt_identity()
     data = request.form
+    saves = []
     
     try:
         new_issue = Issue(
@@ -138,25 +473,43 @@ def report_issue():
             user_id=user_id,
             is_anonymous=data.get('is_anonymous', 'false').lower() == 'true'
         )
+        
+        # Handle file uploads in the background while the issue is inserted
+        for file in request.files.getlist('images'):
+            ext = allowed_extension(file.filename) if file else None
+            if ext:
+                saves.append(upload_executor.submit(store_upload, file, ext))
+        
+        # Insert the issue while the files are written; everything commits
+        # as one transaction
         db.session.add(new_issue)
-        db.session.commit()
+        db.session.flush()
         
-        # Handle file uploads
-        if 'images' in request.files:
-            for file in request.files.getlist('images'):
-                if file and allowed_file(file.filename):
-                    filename = f"{uuid.uuid4()}.{secure_filename(file.filename).rsplit('.', 1)[1].lower()}"
-                    file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
-                    db.session.add(IssueImage(filename=filename, issue_id=new_issue.id))
+        # Identical photos in one report hash to the same file; keep one row
+        filenames = list(dict.fromkeys(save.result()[0] for save in saves))
+        db.session.bulk_insert_mappings(IssueImage, [
+            {'filename': filename, 'issue_id': new_issue.id} for filename in filenames
+        ])
         
         # Log initial status
         log = StatusLog(issue_id=new_issue.id, status="Reported")
         db.session.add(log)
+        db.session.flush()
+        
+        # Build the response from what was just written instead of reading it back
+        response = build_issue_dto(
+            new_issue, user_id,
+            current_user_dto() if not new_issue.is_anonymous else None,
+            images=filenames,
+            logs=[StatusLogDTO(status=log.status, timestamp=log.timestamp, admin=None)]
+        )
         db.session.commit()
+        invalidate_issues_cache()
         
-        return jsonify(format_issue(new_issue, user_id)), 201
+        return jsonify(response), 201
     except Exception as e:
         db.session.rollback()
+        discard_uploads(saves)
         return jsonify({"error": str(e)}), 400
 
 @app.route('/api/issues/<int:issue_id>', methods=['PUT'])
@@ -165,7 +518,7 @@ def update_issue(issue_id):
     user_id = get_jwt_identity()
     issue = Issue.query.get_or_404(issue_id)
     
-    if issue.user_id != user_id and not User.query.get(user_id).is_admin:
+    if issue.user_id != user_id and not current_user_is_admin():
         return jsonify({"error": "Unauthorized"}), 403
     
     data = request.json
@@ -177,13 +530,14 @@ def update_issue(issue_id):
         issue.category = data['category']
     
     db.session.commit()
+    
+    invalidate_issues_cache()
     return jsonify(format_issue(issue, user_id))
 
 @app.route('/api/issues/<int:issue_id>/status', methods=['PUT'])
 @jwt_required()
 def update_issue_status(issue_id):
-    user = User.query.get(get_jwt_identity())
-    if not user.is_admin:
+    if not current_user_is_admin():
         return jsonify({"error": "Unauthorized"}), 403
     
     issue = Issue.query.get_or_404(issue_id)
@@ -193,63 +547,107 @@ def update_issue_status(issue_id):
         return jsonify({"error": "Invalid status"}), 400
     
     issue.status = new_status
-    log = StatusLog(issue_id=issue_id, status=new_status, admin_id=user.id)
+    log = StatusLog(issue_id=issue_id, status=new_status, admin_id=get_jwt_identity())
     db.session.add(log)
     db.session.commit()
+    invalidate_issues_cache()
     
     return jsonify(format_issue(issue))
 
 @app.route('/api/issues/<int:issue_id>/upvote', methods=['POST'])
 @jwt_required()
 def upvote_issue(issue_id):
-    issue = Issue.query.get_or_404(issue_id)
-    issue.upvotes += 1
+    # One vote per user; the votes trigger bumps Issue.upvotes on insert
+    dialect = postgresql if db.engine.dialect.name == 'postgresql' else sqlite
+    try:
+        db.session.execute(
+            dialect.insert(Vote)
+            .values(issue_id=issue_id, user_id=get_jwt_identity())
+            .on_conflict_do_nothing(index_elements=['issue_id', 'user_id'])
+        )
+    except IntegrityError:
+        db.session.rollback()
+        abort(404)
+    
+    upvotes = db.session.scalar(select(Issue.upvotes).where(Issue.id == issue_id))
+    if upvotes is None:
+        db.session.rollback()
+        abort(404)
     db.session.commit()
-    return jsonify({"upvotes": issue.upvotes})
+    invalidate_issues_cache()
+    return jsonify({"upvotes": upvotes})
 
 @app.route('/api/issues/<int:issue_id>/flag', methods=['POST'])
 @jwt_required()
 def flag_issue(issue_id):
-    issue = Issue.query.get_or_404(issue_id)
-    issue.flags += 1
+    flags = db.session.execute(
+        update(Issue)
+        .where(Issue.id == issue_id)
+        .values(
+            flags=Issue.flags + 1,
+            # Auto-hide if flagged by 5 users
+            status=case((Issue.flags + 1 >= 5, "Flagged"), else_=Issue.status)
+        )
+        .returning(Issue.flags)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if flags is None:
+        abort(404)
     
-    if issue.flags >= 5:  # Auto-hide if flagged by 5 users
-        issue.status = "Flagged"
+    if flags >= 5:
         log = StatusLog(issue_id=issue_id, status="Flagged")
         db.session.add(log)
     
     db.session.commit()
-    return jsonify({"flags": issue.flags})
+    
+    invalidate_issues_cache()
+    return jsonify({"flags": flags})
 
 # Admin Routes
 @app.route('/api/admin/issues', methods=['GET'])
 @jwt_required()
 def get_all_issues():
-    user = User.query.get(get_jwt_identity())
-    if not user.is_admin:
+    if not current_user_is_admin():
         return jsonify({"error": "Unauthorized"}), 403
     
-    issues = Issue.query.all()
+    issues = eager_issue_query().all()
     return jsonify([format_issue(issue) for issue in issues])
 
 @app.route('/api/admin/issues/<int:issue_id>', methods=['DELETE'])
 @jwt_required()
 def delete_issue(issue_id):
-    user = User.query.get(get_jwt_identity())
-    if not user.is_admin:
+    if not current_user_is_admin():
         return jsonify({"error": "Unauthorized"}), 403
     
     issue = Issue.query.get_or_404(issue_id)
+    # SQLite doesn't enforce the votes ON DELETE CASCADE unless foreign keys
+    # are switched on, so clear them explicitly
+    db.session.execute(delete(Vote).where(Vote.issue_id == issue_id))
     db.session.delete(issue)
     db.session.commit()
+    invalidate_issues_cache()
     return jsonify({"message": "Issue deleted"})
 
 # Static Files
 @app.route('/uploads/<filename>')
 def uploaded_file(filename):
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    accel_prefix = app.config['UPLOADS_ACCEL_PREFIX']
+    if accel_prefix:
+        # nginx streams the file itself; the worker only sends headers
+        location = safe_join(accel_prefix, filename)
+        if location is None:
+            abort(404)
+        response = app.response_class(mimetype=mimetypes.guess_type(filename)[0])
+        response.headers['X-Accel-Redirect'] = location
+        response.cache_control.max_age = UPLOAD_MAX_AGE
+    else:
+        # Dev fallback; honours USE_X_SENDFILE when set
+        response = send_from_directory(app.config['UPLOAD_FOLDER'], filename, max_age=UPLOAD_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
 
 if __name__ == '__main__':
     with app.app_context():
-        db.create_all()
+        upgrade_schema()
     app.run(debug=True)
\ No newline at end of file
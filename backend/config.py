@@ -6,10 +6,20 @@ load_dotenv()
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///civictrack.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Radius search runs in the database when backed by PostGIS
+    USE_POSTGIS = SQLALCHEMY_DATABASE_URI.startswith('postgresql')
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'super-secret-key')
     UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'uploads')
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB
+    UPLOAD_WORKERS = int(os.getenv('UPLOAD_WORKERS', 4))
+    # Let the front proxy serve /uploads. Apache/lighttpd honour X-Sendfile;
+    # for nginx set UPLOADS_ACCEL_PREFIX to an internal location, e.g.
+    #   location /_uploads/ { internal; alias /path/to/uploads/; sendfile on; }
+    USE_X_SENDFILE = os.getenv('USE_X_SENDFILE', 'false').lower() == 'true'
+    UPLOADS_ACCEL_PREFIX = os.getenv('UPLOADS_ACCEL_PREFIX')
+    REDIS_URL = os.getenv('REDIS_URL')
+    ISSUES_CACHE_TTL = 30  # seconds
 
     @staticmethod
     def init_app(app):
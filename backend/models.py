@@ -1,9 +1,18 @@
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from werkzeug.security import check_password_hash
 from flask_jwt_extended import create_access_token
+from sqlalchemy import DDL, event
+from config import Config
+
+if Config.USE_POSTGIS:
+    from geoalchemy2 import Geography
 
 db = SQLAlchemy()
+ISSUE_GEOM_EXPRESSION = "ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography"
+password_hasher = PasswordHasher()
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -14,14 +23,36 @@ class User(db.Model):
     is_admin = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    issues = db.relationship('Issue', back_populates='user')
+    status_updates = db.relationship('StatusLog', back_populates='admin')
+
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        """Verify the password, upgrading legacy or outdated hashes in place."""
+        if not self.password_hash:
+            return False
+        if not self.password_hash.startswith('$argon2'):
+            # Accounts created before argon2id still carry werkzeug hashes
+            if not check_password_hash(self.password_hash, password):
+                return False
+            self.set_password(password)
+            return True
+        try:
+            password_hasher.verify(self.password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+        if password_hasher.check_needs_rehash(self.password_hash):
+            self.set_password(password)
+        return True
 
     def generate_token(self):
-        return create_access_token(identity=self.id)
+        # Carry the role and name in the token so requests don't need a DB hit
+        return create_access_token(identity=self.id, additional_claims={
+            'is_admin': bool(self.is_admin),
+            'username': self.username
+        })
 
 class Issue(db.Model):
     __tablename__ = 'issues'
@@ -37,10 +68,30 @@ class Issue(db.Model):
     is_anonymous = db.Column(db.Boolean, default=False)
     upvotes = db.Column(db.Integer, default=0)
     flags = db.Column(db.Integer, default=0)
+
+    __table_args__ = (
+        db.Index('ix_issues_cat_status', 'category', 'status'),
+    )
+    if Config.USE_POSTGIS:
+        # Stored generated column: always in sync with lat/lon, no hooks needed.
+        # Only used for filtering, so list queries don't select it.
+        geom = db.deferred(db.Column(
+            Geography(geometry_type='POINT', srid=4326, spatial_index=False),
+            db.Computed(ISSUE_GEOM_EXPRESSION, persisted=True)
+        ))
+        # SP-GiST is smaller and faster than GiST for point-only data
+        __table_args__ += (
+            db.Index('ix_issues_geom_spgist', 'geom', postgresql_using='spgist'),
+        )
+    else:
+        # Backs the bounding-box prefilter in get_issues; PostGIS doesn't use it
+        __table_args__ += (
+            db.Index('ix_issues_lat_lon', 'latitude', 'longitude'),
+        )
     
-    user = db.relationship('User', backref=db.backref('issues', lazy=True))
-    images = db.relationship('IssueImage', backref='issue', lazy=True)
-    logs = db.relationship('StatusLog', backref='issue', lazy=True)
+    user = db.relationship('User', back_populates='issues')
+    images = db.relationship('IssueImage', back_populates='issue')
+    logs = db.relationship('StatusLog', back_populates='issue')
 
 class IssueImage(db.Model):
     __tablename__ = 'issue_images'
@@ -48,6 +99,8 @@ class IssueImage(db.Model):
     filename = db.Column(db.String(255), nullable=False)
     issue_id = db.Column(db.Integer, db.ForeignKey('issues.id'))
 
+    issue = db.relationship('Issue', back_populates='images')
+
 class StatusLog(db.Model):
     __tablename__ = 'status_logs'
     id = db.Column(db.Integer, primary_key=True)
@@ -56,4 +109,53 @@ class StatusLog(db.Model):
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     admin_id = db.Column(db.Integer, db.ForeignKey('users.id'))
     
-    admin = db.relationship('User', backref=db.backref('status_updates', lazy=True))
\ No newline at end of file
+    issue = db.relationship('Issue', back_populates='logs')
+    admin = db.relationship('User', back_populates='status_updates')
+
+class Vote(db.Model):
+    __tablename__ = 'votes'
+    id = db.Column(db.Integer, primary_key=True)
+    issue_id = db.Column(db.Integer, db.ForeignKey('issues.id', ondelete='CASCADE'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('issue_id', 'user_id', name='uq_votes_issue_user'),
+    )
+
+# Keep Issue.upvotes in step with votes inside the database
+event.listen(Vote.__table__, 'after_create', DDL("""
+    CREATE OR REPLACE FUNCTION increment_issue_upvotes() RETURNS trigger AS $$
+    BEGIN
+        UPDATE issues SET upvotes = upvotes + 1 WHERE id = NEW.issue_id;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    CREATE TRIGGER votes_increment_upvotes AFTER INSERT ON votes
+    FOR EACH ROW EXECUTE FUNCTION increment_issue_upvotes();
+""").execute_if(dialect='postgresql'))
+event.listen(Vote.__table__, 'after_drop', DDL(
+    "DROP FUNCTION IF EXISTS increment_issue_upvotes()"
+).execute_if(dialect='postgresql'))
+event.listen(Vote.__table__, 'after_create', DDL("""
+    CREATE TRIGGER votes_increment_upvotes AFTER INSERT ON votes
+    BEGIN
+        UPDATE issues SET upvotes = upvotes + 1 WHERE id = NEW.issue_id;
+    END
+""").execute_if(dialect='sqlite'))
+
+def upgrade_schema():
+    """Create missing tables and bring existing ones up to the current models.
+
+    create_all() skips tables that already exist, so columns and indexes
+    added to them later are applied here.
+    """
+    db.create_all()
+    with db.engine.begin() as conn:
+        if Config.USE_POSTGIS:
+            conn.execute(db.text(
+                "ALTER TABLE issues ADD COLUMN IF NOT EXISTS geom geography(POINT,4326) "
+                "GENERATED ALWAYS AS (%s) STORED" % ISSUE_GEOM_EXPRESSION
+            ))
+        for index in Issue.__table__.indexes:
+            index.create(conn, checkfirst=True)
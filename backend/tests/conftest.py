@@ -0,0 +1,90 @@
+import os
+import threading
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+# Config reads DATABASE_URL at import time, so point it at a throwaway DB first
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from app import app as flask_app  # noqa: E402
+from models import db, User, Issue, IssueImage, StatusLog  # noqa: E402
+
+
+@contextmanager
+def count_queries(engine):
+    """Collect the SQL statements this thread runs on engine inside the block."""
+    statements = []
+    thread_id = threading.get_ident()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == thread_id:
+            statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+@pytest.fixture
+def app(tmp_path):
+    flask_app.config.update(TESTING=True, UPLOAD_FOLDER=str(tmp_path))
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def query_counter(app):
+    return lambda: count_queries(db.engine)
+
+
+def create_user(username, is_admin=False, password=None):
+    user = User(username=username, email=f'{username}@example.com', is_admin=is_admin)
+    if password:
+        user.set_password(password)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def auth_headers(client):
+    create_user('citizen', password='password')
+    response = client.post('/api/auth/login', json={'username': 'citizen', 'password': 'password'})
+    return {'Authorization': f"Bearer {response.json['token']}"}
+
+
+@pytest.fixture
+def make_issues(app):
+    """Seed issues near (28.6, 77.2) with every relationship format_issue reads."""
+    def make(count):
+        admin = create_user(f'admin{count}', is_admin=True)
+        for i in range(count):
+            # A reporter per issue, so a lazy user load costs one query per row
+            reporter = create_user(f'reporter{count}-{i}')
+            issue = Issue(
+                title=f'Pothole {i}', description='Deep', category='Roads',
+                latitude=28.6 + i * 0.001, longitude=77.2, user_id=reporter.id
+            )
+            db.session.add(issue)
+            db.session.flush()
+            db.session.add_all([
+                IssueImage(filename=f'{i}-a.png', issue_id=issue.id),
+                IssueImage(filename=f'{i}-b.png', issue_id=issue.id),
+                StatusLog(issue_id=issue.id, status='Reported'),
+                StatusLog(issue_id=issue.id, status='In Progress', admin_id=admin.id),
+            ])
+        db.session.commit()
+        db.session.expunge_all()
+    return make
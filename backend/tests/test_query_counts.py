@@ -0,0 +1,56 @@
+import io
+
+import pytest
+
+# Query budgets per endpoint; these guard against N+1 regressions rather than
+# measuring speed, so they must hold regardless of how many issues exist.
+LIST_ISSUES_MAX_QUERIES = 5
+REPORT_ISSUE_MAX_QUERIES = 3
+
+
+@pytest.mark.parametrize('count', [1, 25])
+def test_list_issues_query_count(client, auth_headers, make_issues, query_counter, count):
+    make_issues(count)
+
+    with query_counter() as statements:
+        response = client.get('/api/issues?lat=28.6&lon=77.2&radius=5', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert len(response.json) == count
+    assert all(issue['user'] and len(issue['logs']) == 2 for issue in response.json)
+    assert len(statements) <= LIST_ISSUES_MAX_QUERIES
+
+
+def test_list_issues_query_count_independent_of_size(client, make_issues, query_counter):
+    make_issues(1)
+    with query_counter() as small:
+        client.get('/api/issues?lat=28.6&lon=77.2&radius=5')
+
+    make_issues(25)
+    with query_counter() as large:
+        client.get('/api/issues?lat=28.6&lon=77.2&radius=5')
+
+    assert len(small) == len(large)
+
+
+def test_report_issue_query_count(client, auth_headers, query_counter):
+    data = {
+        'title': 'Broken streetlight', 'description': 'Dark corner', 'category': 'Lighting',
+        'latitude': '28.6', 'longitude': '77.2',
+        'images': [(io.BytesIO(b'first'), 'a.png'), (io.BytesIO(b'second'), 'b.jpg')],
+    }
+
+    with query_counter() as statements:
+        response = client.post(
+            '/api/issues', headers=auth_headers, data=data, content_type='multipart/form-data'
+        )
+
+    assert response.status_code == 201
+    assert response.json['user']['username'] == 'citizen'
+    assert len(response.json['images']) == 2
+    assert [log['status'] for log in response.json['logs']] == ['Reported']
+    assert len(statements) <= REPORT_ISSUE_MAX_QUERIES
+
+    # Built without reading the issue back, but must match what listings serve
+    listed = client.get('/api/issues?lat=28.6&lon=77.2', headers=auth_headers).json
+    assert [issue for issue in listed if issue['id'] == response.json['id']] == [response.json]